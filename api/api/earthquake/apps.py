@@ -9,3 +9,18 @@ class EarthquakeConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "api.earthquake"
+
+    def ready(self) -> None:
+        """
+        Connects the signal handlers that keep cached earthquake searches in sync
+        with City changes. The handlers live outside views.py, so loading the app does not
+        import the search services and their Numba warm-up.
+        """
+        from django.db.models.signals import post_delete, post_save, pre_save
+
+        from .models import City
+        from .search_cache import invalidate_city_searches, track_city_coordinates
+
+        pre_save.connect(track_city_coordinates, sender=City, dispatch_uid="track_city_coordinates")
+        post_save.connect(invalidate_city_searches, sender=City, dispatch_uid="invalidate_city_searches_on_save")
+        post_delete.connect(invalidate_city_searches, sender=City, dispatch_uid="invalidate_city_searches_on_delete")
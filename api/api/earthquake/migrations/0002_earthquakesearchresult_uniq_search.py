@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-15 09:12
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_searches(apps, schema_editor):
+    """
+    Keeps the oldest (lowest id) EarthquakeSearchResult of each (city, start_date, end_date)
+    group and deletes the rest, so the unique constraint below can be created.
+    """
+    EarthquakeSearchResult = apps.get_model("earthquake", "EarthquakeSearchResult")
+    duplicate_groups = (
+        EarthquakeSearchResult.objects.values("city", "start_date", "end_date")
+        .annotate(keep_id=Min("id"), row_count=Count("id"))
+        .filter(row_count__gt=1)
+    )
+    for group in duplicate_groups:
+        EarthquakeSearchResult.objects.filter(
+            city=group["city"],
+            start_date=group["start_date"],
+            end_date=group["end_date"],
+        ).exclude(id=group["keep_id"]).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("earthquake", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="earthquakesearchresult",
+            name="earthquake__city_id_0d0220_idx",
+        ),
+        migrations.RunPython(remove_duplicate_searches, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="earthquakesearchresult",
+            constraint=models.UniqueConstraint(
+                fields=("city", "start_date", "end_date"), name="uniq_search"
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2 on 2026-10-15 10:04
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("earthquake", "0002_earthquakesearchresult_uniq_search"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="city",
+            name="latitude",
+            field=models.FloatField(
+                validators=[
+                    django.core.validators.MinValueValidator(-90),
+                    django.core.validators.MaxValueValidator(90),
+                ]
+            ),
+        ),
+        migrations.AlterField(
+            model_name="city",
+            name="longitude",
+            field=models.FloatField(
+                validators=[
+                    django.core.validators.MinValueValidator(-180),
+                    django.core.validators.MaxValueValidator(180),
+                ]
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2 on 2026-10-15 11:27
+
+import api.earthquake.utils
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("earthquake", "0003_alter_city_latitude_alter_city_longitude"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="earthquakesearchresult",
+            name="raw_earthquake_data",
+            field=models.JSONField(
+                blank=True,
+                decoder=api.earthquake.utils.OrjsonDecoder,
+                default=dict,
+                encoder=api.earthquake.utils.OrjsonEncoder,
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 4.2 on 2026-10-15 11:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("earthquake", "0004_alter_earthquakesearchresult_raw_earthquake_data"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="earthquakesearchresult",
+            index=models.Index(fields=["-created_at"], name="eq_created_desc_idx"),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2 on 2026-10-15 12:41
+
+from math import cos, radians
+
+from django.db import migrations, models
+
+
+def populate_trig_columns(apps, schema_editor):
+    City = apps.get_model("earthquake", "City")
+    cities = list(City.objects.all())
+    for city in cities:
+        city.lat_rad = radians(city.latitude)
+        city.lon_rad = radians(city.longitude)
+        city.cos_lat = cos(city.lat_rad)
+    City.objects.bulk_update(cities, ["lat_rad", "lon_rad", "cos_lat"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("earthquake", "0005_earthquakesearchresult_eq_created_desc_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="city",
+            name="cos_lat",
+            field=models.FloatField(default=0.0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="city",
+            name="lat_rad",
+            field=models.FloatField(default=0.0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="city",
+            name="lon_rad",
+            field=models.FloatField(default=0.0, editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_trig_columns, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,12 @@
-from decimal import Decimal
+from datetime import date, datetime
+from math import cos, radians
+from typing import Optional
 
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
+from .utils import OrjsonDecoder, OrjsonEncoder
+
 
 class City(models.Model):
     """
@@ -10,21 +15,40 @@ class City(models.Model):
 
     Args:
         name (str): The unique name of the city.
-        latitude (Decimal): The latitude coordinate of the city.
-        longitude (Decimal): The longitude coordinate of the city.
+        latitude (float): The latitude coordinate of the city.
+        longitude (float): The longitude coordinate of the city.
 
     Attributes:
         name (str): The city name stored in the database.
-        latitude (Decimal): The stored latitude of this city.
-        longitude (Decimal): The stored longitude of this city.
+        latitude (float): The stored latitude of this city.
+        longitude (float): The stored longitude of this city.
+        lat_rad (float): The latitude in radians, derived on save.
+        lon_rad (float): The longitude in radians, derived on save.
+        cos_lat (float): The cosine of the latitude, derived on save.
         created_at (datetime): The timestamp indicating when this city entry was created.
     """
 
     name: str = models.CharField(max_length=255, unique=True)
-    latitude: Decimal = models.DecimalField(max_digits=9, decimal_places=6)
-    longitude: Decimal = models.DecimalField(max_digits=9, decimal_places=6)
+    latitude: float = models.FloatField(validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude: float = models.FloatField(validators=[MinValueValidator(-180), MaxValueValidator(180)])
+    # Precomputed for haversine against this city; bulk_create/update() bypass save() and skip them
+    lat_rad: float = models.FloatField(editable=False)
+    lon_rad: float = models.FloatField(editable=False)
+    cos_lat: float = models.FloatField(editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs) -> None:
+        """
+        Derives lat_rad, lon_rad and cos_lat from the coordinates before saving.
+        """
+        self.lat_rad = radians(self.latitude)
+        self.lon_rad = radians(self.longitude)
+        self.cos_lat = cos(self.lat_rad)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "lat_rad", "lon_rad", "cos_lat"}
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         """
         Returns a string representation of the City.
@@ -62,7 +86,7 @@ class EarthquakeSearchResult(models.Model):
     city = models.ForeignKey(City, on_delete=models.CASCADE)
     start_date = models.DateField()
     end_date = models.DateField()
-    raw_earthquake_data = models.JSONField(default=dict, blank=True)
+    raw_earthquake_data = models.JSONField(default=dict, blank=True, encoder=OrjsonEncoder, decoder=OrjsonDecoder)
     nearest_earthquake_location = models.CharField(max_length=255, null=True, blank=True)
     nearest_earthquake_magnitude = models.FloatField(null=True, blank=True)
     nearest_earthquake_time = models.DateTimeField(null=True, blank=True)
@@ -71,22 +95,51 @@ class EarthquakeSearchResult(models.Model):
 
     @property
     def verbose_msg(self):
-        try:
-            msg = (
-                f"Result for {self.city.name} between {self.start_date.strftime('%B %d %Y')} "
-                f"and {self.end_date.strftime('%B %d %Y')}:"
-                f" The closest earthquake to {self.city.name} was a "
-                f"M {self.raw_earthquake_data['properties']['mag']} at {self.distance_km:.1f} km away, "
-                f"{self.raw_earthquake_data['properties']['place']}, "
-                f"on {self.nearest_earthquake_time.strftime('%B %d %Y at %H:%M')} UTC."
-            )
-        except KeyError:
-            msg = "No results found"
-        return msg
+        return self.build_verbose_msg(
+            city_name=self.city.name,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            magnitude=self.nearest_earthquake_magnitude,
+            location=self.nearest_earthquake_location,
+            distance_km=self.distance_km,
+            time=self.nearest_earthquake_time,
+        )
+
+    @staticmethod
+    def build_verbose_msg(
+        city_name: str,
+        start_date: date,
+        end_date: date,
+        magnitude: Optional[float],
+        location: Optional[str],
+        distance_km: Optional[float],
+        time: Optional[datetime],
+    ) -> str:
+        """
+        Builds the human-readable summary of a search result from its scalar columns, so it
+        can be produced both for model instances and for plain .values() rows.
+
+        Returns:
+            str: The summary message, or "No results found" if no earthquake was found.
+        """
+        if time is None or distance_km is None:
+            return "No results found"
+        return (
+            f"Result for {city_name} between {start_date.strftime('%B %d %Y')} "
+            f"and {end_date.strftime('%B %d %Y')}:"
+            f" The closest earthquake to {city_name} was a "
+            f"M {magnitude} at {distance_km:.1f} km away, "
+            f"{location}, "
+            f"on {time.strftime('%B %d %Y at %H:%M')} UTC."
+        )
 
     class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["city", "start_date", "end_date"], name="uniq_search"),
+        ]
         indexes = [
-            models.Index(fields=["city", "start_date", "end_date"]),
+            # Backs the newest-first history listing
+            models.Index(fields=["-created_at"], name="eq_created_desc_idx"),
         ]
 
     def __str__(self) -> str:
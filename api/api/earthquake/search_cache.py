@@ -0,0 +1,76 @@
+import time
+from datetime import date
+
+from django.core.cache import cache
+from django.db import transaction
+
+from api.earthquake.models import City, EarthquakeSearchResult
+
+SEARCH_CACHE_VERSION_KEY = "eq:ver"
+SEARCH_CACHE_TIMEOUT = 3600
+
+
+def _new_search_cache_version() -> int:
+    """
+    Seeds a search cache version from the clock, so a version re-created after eviction
+    never collides with keys still stored under an earlier one.
+    """
+    return int(time.time())
+
+
+def get_search_cache_key(city_id: int, start_date: date, end_date: date) -> str:
+    """
+    Builds the cache key for an earthquake search, namespaced by the current cache version.
+
+    Args:
+        city_id (int): The ID of the searched city.
+        start_date (date): The start date of the search range.
+        end_date (date): The end date of the search range.
+
+    Returns:
+        str: The versioned cache key.
+    """
+    version = cache.get_or_set(SEARCH_CACHE_VERSION_KEY, _new_search_cache_version, timeout=None)
+    return f"earthquake:v{version}:{city_id}:{start_date}:{end_date}"
+
+
+def bump_search_cache_version() -> None:
+    """
+    Invalidates every cached earthquake search at once by moving to a new key version.
+    """
+    try:
+        cache.incr(SEARCH_CACHE_VERSION_KEY)
+    except ValueError:
+        # Version key was evicted or never set
+        cache.set(SEARCH_CACHE_VERSION_KEY, _new_search_cache_version(), timeout=None)
+
+
+def track_city_coordinates(sender, instance: City, raw: bool = False, update_fields=None, **kwargs) -> None:
+    """
+    Records on the instance whether this save moves an existing City, by comparing its
+    coordinates with the stored row. Connected to the City pre_save signal.
+    """
+    stored = None
+    coordinate_fields = {"latitude", "longitude"}
+    if instance.pk is not None and not raw and (update_fields is None or coordinate_fields & set(update_fields)):
+        stored = sender.objects.filter(pk=instance.pk).values_list("latitude", "longitude").first()
+    instance._coordinates_changed = stored is not None and stored != (
+        float(instance.latitude),
+        float(instance.longitude),
+    )
+
+
+def invalidate_city_searches(sender, instance: City, created: bool = False, **kwargs) -> None:
+    """
+    Bumps the search cache version when an existing City is updated or deleted, since its
+    cached searches may now be wrong or belong to a city that no longer exists. Creating a
+    city leaves other cities' searches untouched. When an update moves the city, its stored
+    search results were computed for the old location and are deleted, so the next search
+    recomputes them. Connected to City post_save/post_delete signals; the bump waits for the
+    commit so a concurrent request can't re-cache old data.
+    """
+    if created:
+        return
+    if getattr(instance, "_coordinates_changed", False):
+        EarthquakeSearchResult.objects.filter(city=instance).delete()
+    transaction.on_commit(bump_search_cache_version)
@@ -75,3 +75,59 @@ class EarthquakeSearchResultSerializer(serializers.ModelSerializer):
     class Meta:
         model = EarthquakeSearchResult
         fields = "__all__"
+
+
+# Unbound fields used only for their output formatting
+_DATE_FIELD = serializers.DateField()
+_DATETIME_FIELD = serializers.DateTimeField()
+
+
+class EarthquakeSearchHistorySerializer(serializers.Serializer):
+    """
+    Lightweight read-only serializer for the search history list. It works on plain
+    dicts from EarthquakeSearchResult.objects.values(*VALUES_FIELDS) instead of model
+    instances, and produces the same output as EarthquakeSearchResultSerializer.
+    """
+
+    VALUES_FIELDS = (
+        "id",
+        "city",
+        "city__name",
+        "start_date",
+        "end_date",
+        "nearest_earthquake_location",
+        "nearest_earthquake_magnitude",
+        "nearest_earthquake_time",
+        "distance_km",
+        "created_at",
+    )
+
+    def to_representation(self, instance: dict) -> dict:
+        """
+        Converts a values() row into the same output EarthquakeSearchResultSerializer
+        produces for the model instance.
+
+        Args:
+            instance (dict): A row from EarthquakeSearchResult.objects.values(*VALUES_FIELDS).
+
+        Returns:
+            dict: The serialized search result.
+        """
+        data = dict(instance)
+        data["city_name"] = data.pop("city__name")
+        data["verbose_msg"] = EarthquakeSearchResult.build_verbose_msg(
+            city_name=data["city_name"],
+            start_date=data["start_date"],
+            end_date=data["end_date"],
+            magnitude=data["nearest_earthquake_magnitude"],
+            location=data["nearest_earthquake_location"],
+            distance_km=data["distance_km"],
+            time=data["nearest_earthquake_time"],
+        )
+        # Keep date formatting identical to the model serializer
+        for field in ("start_date", "end_date"):
+            data[field] = _DATE_FIELD.to_representation(data[field])
+        for field in ("nearest_earthquake_time", "created_at"):
+            if data[field] is not None:
+                data[field] = _DATETIME_FIELD.to_representation(data[field])
+        return data
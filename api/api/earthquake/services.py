@@ -1,8 +1,98 @@
+import math
 from datetime import datetime
+from functools import partial
+from operator import itemgetter
+from typing import Iterable, List, NamedTuple, Optional, Tuple
 
-import requests
+import numpy as np
+import requests_cache
+from django.core.cache import cache
+from numba import njit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from .utils import calculate_distance
+from .utils import calculate_distance_from_anchor
+
+EARTH_RADIUS_KM = 6371.0
+
+# Below this many features the dispatch overhead of the compiled haversine
+# kernel outweighs its speedup, so the plain Python loop is used.
+VECTORIZE_MIN_FEATURES = 32
+
+EARTHQUAKE_CATALOG_TIMEOUT = 3600
+
+# (connect, read) timeouts for USGS calls, in seconds
+USGS_TIMEOUT = (3.05, 10)
+
+# Shared HTTP session for USGS calls. Responses are cached on disk by URL + params,
+# so cities searching the same date range reuse one download; USGS Cache-Control and
+# ETag headers are honored, and a stale copy is served if the API is unreachable.
+# Cache misses go through a pooled adapter that keeps TLS connections alive between calls.
+session = requests_cache.CachedSession(
+    "usgs_cache",
+    backend="filesystem",
+    expire_after=3600,
+    cache_control=True,
+    stale_if_error=True,
+)
+session.mount(
+    "https://",
+    HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=Retry(total=3, backoff_factor=0.3)),
+)
+
+
+@njit(cache=True, fastmath=True)
+def _nearest_idx(lat1_r: float, lon1_r: float, cos_lat1: float, lons: np.ndarray, lats: np.ndarray) -> tuple:
+    """
+    Finds the index of the point closest to the city in a single fused haversine pass.
+
+    Args:
+        lat1_r (float): The latitude of the city, in radians.
+        lon1_r (float): The longitude of the city, in radians.
+        cos_lat1 (float): The cosine of the city's latitude.
+        lons (np.ndarray): Contiguous float64 array of point longitudes.
+        lats (np.ndarray): Contiguous float64 array of point latitudes.
+
+    Returns:
+        tuple: The index of the nearest point and its distance in kilometers.
+    """
+    # fastmath assumes no infinities, so seed with a bound longer than any great-circle distance
+    min_i = 0
+    min_d = 2 * math.pi * EARTH_RADIUS_KM
+    for i in range(lons.shape[0]):
+        lat2_r = math.radians(lats[i])
+        sin_dlat = math.sin((lat2_r - lat1_r) / 2)
+        sin_dlon = math.sin((math.radians(lons[i]) - lon1_r) / 2)
+        a = sin_dlat * sin_dlat + cos_lat1 * math.cos(lat2_r) * sin_dlon * sin_dlon
+        d = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+        if d < min_d:
+            min_d = d
+            min_i = i
+    return min_i, min_d
+
+
+# Compile once at import so the first request doesn't pay the JIT cost. Catalogs
+# restored from the cache hold read-only arrays, which Numba compiles separately.
+_warmup = np.zeros(1)
+_nearest_idx(0.0, 0.0, 1.0, _warmup, _warmup)
+_warmup.flags.writeable = False
+_nearest_idx(0.0, 0.0, 1.0, _warmup, _warmup)
+
+
+class EarthquakeCatalog(NamedTuple):
+    """
+    Earthquake features for one USGS query, with their coordinates pre-extracted
+    into parallel arrays for vectorized distance calculations.
+
+    Attributes:
+        lons (np.ndarray): Contiguous float64 array of earthquake longitudes.
+        lats (np.ndarray): Contiguous float64 array of earthquake latitudes.
+        features (list): The GeoJSON earthquake features, in the same order as the arrays.
+    """
+
+    lons: np.ndarray
+    lats: np.ndarray
+    features: List[dict]
 
 
 def fetch_earthquakes(
@@ -14,8 +104,9 @@ def fetch_earthquakes(
     """
     Fetches earthquake data from the USGS API within a specified date range and minimum magnitude.
 
-    This function sends a GET request to the USGS endpoint and retrieves a GeoJSON response
-    containing earthquake data. It raises an HTTPError if the request fails.
+    This function sends a GET request to the USGS endpoint through the shared cached session
+    and retrieves a GeoJSON response containing earthquake data. It raises an HTTPError if
+    the request fails.
 
     Args:
         start_date (date): The start date of the search range.
@@ -35,40 +126,107 @@ def fetch_earthquakes(
         "orderby": orderby,
         "format": "geojson",
     }
-    response = requests.get(USGS_URL, params=params)
+    response = session.get(USGS_URL, params=params, timeout=USGS_TIMEOUT)
     response.raise_for_status()
     return response.json()
 
 
-def find_nearest_earthquake(city_lat: float, city_lon: float, earthquakes: dict) -> dict:
+def build_earthquake_catalog(features: Iterable[dict]) -> EarthquakeCatalog:
     """
-    Finds the nearest earthquake to a given city from a list of earthquake features.
+    Collects earthquake features and extracts their coordinates in a single pass.
 
-    Iterates through the earthquake features returned by the USGS API response, calculates
-    the distance of each to the given city coordinates, and selects the one with the minimum distance.
+    Args:
+        features (Iterable[dict]): The GeoJSON earthquake features.
+
+    Returns:
+        EarthquakeCatalog: The features along with their longitude and latitude arrays.
+    """
+    collected = []
+    lons = []
+    lats = []
+    for feature in features:
+        coords = feature["geometry"]["coordinates"]  # [lon, lat, depth]
+        collected.append(feature)
+        lons.append(coords[0])
+        lats.append(coords[1])
+    return EarthquakeCatalog(
+        np.ascontiguousarray(lons, dtype=np.float64),
+        np.ascontiguousarray(lats, dtype=np.float64),
+        collected,
+    )
+
+
+def get_earthquake_catalog(
+    start_date: datetime.date,
+    end_date: datetime.date,
+    min_magnitude: float = 5.0,
+) -> EarthquakeCatalog:
+    """
+    Returns the earthquake catalog for a date range, fetching it from USGS on a cache miss.
+
+    The USGS response for a date range is the same for every city, so the parsed catalog
+    is cached and each additional city searching that range only reruns the distance pass.
 
     Args:
-        city_lat (float): The latitude of the city.
-        city_lon (float): The longitude of the city.
-        earthquakes (dict): The dictionary of earthquake data (GeoJSON), must contain 'features'.
+        start_date (date): The start date of the search range.
+        end_date (date): The end date of the search range.
+        min_magnitude (float, optional): The minimum magnitude of earthquakes to retrieve.
+            Defaults to 5.0.
 
     Returns:
-        dict: The nearest earthquake feature dictionary. Returns None if no earthquakes are found.
+        EarthquakeCatalog: The features along with their longitude and latitude arrays.
     """
-    if not earthquakes or "features" not in earthquakes:
-        return None
-    features = earthquakes["features"]
+    cache_key = f"usgs:{start_date}:{end_date}:{min_magnitude}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        lons_bytes, lats_bytes, features = cached
+        return EarthquakeCatalog(
+            np.frombuffer(lons_bytes, dtype=np.float64),
+            np.frombuffer(lats_bytes, dtype=np.float64),
+            features,
+        )
+
+    earthquakes = fetch_earthquakes(start_date, end_date, min_magnitude=min_magnitude)
+    catalog = build_earthquake_catalog(earthquakes.get("features") or [])
+    cache.set(
+        cache_key,
+        (catalog.lons.tobytes(), catalog.lats.tobytes(), catalog.features),
+        timeout=EARTHQUAKE_CATALOG_TIMEOUT,
+    )
+    return catalog
+
+
+def find_nearest_earthquake(
+    city_lat_rad: float, city_lon_rad: float, city_cos_lat: float, catalog: EarthquakeCatalog
+) -> Tuple[Optional[dict], Optional[float]]:
+    """
+    Finds the nearest earthquake to a given city from a catalog of earthquake features.
+
+    Calculates the haversine distance of every earthquake in the catalog to the given city
+    coordinates and selects the one with the minimum distance. Small catalogs are scanned
+    in a plain loop; larger ones go through a compiled Numba kernel over the coordinate arrays.
+
+    Args:
+        city_lat_rad (float): The latitude of the city, in radians (City.lat_rad).
+        city_lon_rad (float): The longitude of the city, in radians (City.lon_rad).
+        city_cos_lat (float): The cosine of the city's latitude (City.cos_lat).
+        catalog (EarthquakeCatalog): The earthquake features and their coordinate arrays.
+
+    Returns:
+        tuple: The nearest earthquake feature dictionary and its haversine distance to the city
+            in kilometers. Returns (None, None) if no earthquakes are found.
+    """
+    features = catalog.features
     if not features:
-        return None
+        return None, None
 
-    min_dist = float("inf")
-    nearest = None
-    for feature in features:
-        coords = feature["geometry"]["coordinates"]  # [lon, lat, depth]
-        eq_lon, eq_lat = coords[0], coords[1]
-        dist = calculate_distance(city_lat, city_lon, eq_lat, eq_lon)
-        if dist < min_dist:
-            min_dist = dist
-            nearest = feature
+    if len(features) < VECTORIZE_MIN_FEATURES:
+        # map() and min() keep the per-feature call and comparison in C
+        distance_to = partial(calculate_distance_from_anchor, city_lat_rad, city_lon_rad, city_cos_lat)
+        distances = map(distance_to, catalog.lats.tolist(), catalog.lons.tolist())
+        idx, min_dist = min(enumerate(distances), key=itemgetter(1))
+        return features[idx], min_dist
+
+    idx, min_dist = _nearest_idx(city_lat_rad, city_lon_rad, city_cos_lat, catalog.lons, catalog.lats)
 
-    return nearest
+    return features[idx], min_dist
@@ -1,37 +1,74 @@
-from decimal import Decimal
-from math import atan2, cos, radians, sin, sqrt
-from typing import Union
+import json
+from math import asin, cos, radians, sin, sqrt
+from typing import Any
 
+import orjson
 
-def calculate_distance(
-    lat1: Union[Decimal, float],
-    lon1: Union[Decimal, float],
-    lat2: Union[Decimal, float],
-    lon2: Union[Decimal, float],
-) -> float:
+
+def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculates the great-circle distance between two points on Earth using the Haversine formula.
 
     Args:
-        lat1 (Decimal or float): The latitude of the first point.
-        lon1 (Decimal or float): The longitude of the first point.
-        lat2 (Decimal or float): The latitude of the second point.
-        lon2 (Decimal or float): The longitude of the second point.
+        lat1 (float): The latitude of the first point.
+        lon1 (float): The longitude of the first point.
+        lat2 (float): The latitude of the second point.
+        lon2 (float): The longitude of the second point.
 
     Returns:
         float: The distance in kilometers between the two given points.
     """
-    # Convert Decimal to float if necessary
-    lat1_f: float = float(lat1)
-    lon1_f: float = float(lon1)
-    lat2_f: float = float(lat2)
-    lon2_f: float = float(lon2)
+    lat1_r: float = radians(lat1)
+    return calculate_distance_from_anchor(lat1_r, radians(lon1), cos(lat1_r), lat2, lon2)
+
+
+def calculate_distance_from_anchor(lat1_r: float, lon1_r: float, cos_lat1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculates the Haversine distance from a fixed anchor point whose radians and latitude
+    cosine are already known (e.g. a City's stored lat_rad, lon_rad and cos_lat), so only
+    the second point's trigonometry is evaluated.
+
+    Args:
+        lat1_r (float): The latitude of the anchor point, in radians.
+        lon1_r (float): The longitude of the anchor point, in radians.
+        cos_lat1 (float): The cosine of the anchor point's latitude.
+        lat2 (float): The latitude of the second point.
+        lon2 (float): The longitude of the second point.
 
+    Returns:
+        float: The distance in kilometers between the two given points.
+    """
     earth_radius: float = 6371.0  # Earth radius in km
-    dlat: float = radians(lat2_f - lat1_f)
-    dlon: float = radians(lon2_f - lon1_f)
+    lat2_r: float = radians(lat2)
+    dlat: float = lat2_r - lat1_r
+    dlon: float = radians(lon2) - lon1_r
 
-    a: float = sin(dlat / 2) ** 2 + cos(radians(lat1_f)) * cos(radians(lat2_f)) * sin(dlon / 2) ** 2
-    c: float = 2 * atan2(sqrt(a), sqrt(1 - a))
+    a: float = sin(dlat / 2) ** 2 + cos_lat1 * cos(lat2_r) * sin(dlon / 2) ** 2
+    # Clamp to guard asin against rounding pushing a slightly above 1
+    c: float = 2 * asin(sqrt(min(1.0, a)))
     distance: float = earth_radius * c
     return distance
+
+
+class OrjsonEncoder(json.JSONEncoder):
+    """
+    A JSON encoder that serializes with orjson, for use as a JSONField encoder.
+
+    Django passes it to json.dumps as cls, which only calls encode(), so the whole
+    document is handed to orjson in one call.
+    """
+
+    def encode(self, o: Any) -> str:
+        return orjson.dumps(o, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class OrjsonDecoder(json.JSONDecoder):
+    """
+    A JSON decoder that parses with orjson, for use as a JSONField decoder.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so Django's handling
+    of undecodable values is unchanged.
+    """
+
+    def decode(self, s: str, *args: Any) -> Any:
+        return orjson.loads(s)
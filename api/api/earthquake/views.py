@@ -1,12 +1,12 @@
-from datetime import datetime
+from datetime import date, datetime, timezone
 from math import ceil
 
 from django.core.cache import cache
-from django.db import IntegrityError
-from django.utils.dateparse import parse_date
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from drf_orjson_renderer.renderers import ORJSONRenderer
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
-from geopy.distance import geodesic
 from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.request import Request
@@ -14,8 +14,27 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from api.earthquake.models import City, EarthquakeSearchResult
-from api.earthquake.serializers import CitySerializer, EarthquakeSearchResultSerializer
-from api.earthquake.services import fetch_earthquakes, find_nearest_earthquake
+from api.earthquake.serializers import (
+    CitySerializer,
+    EarthquakeSearchHistorySerializer,
+    EarthquakeSearchResultSerializer,
+)
+from api.earthquake.search_cache import SEARCH_CACHE_TIMEOUT, get_search_cache_key
+from api.earthquake.services import find_nearest_earthquake, get_earthquake_catalog
+
+
+def cache_search_result(cache_key: str, data: dict) -> None:
+    """
+    Stores serialized search data in the cache once the current transaction commits,
+    so a rolled-back result is never cached. Only the pre-rendered JSON bytes are stored,
+    which cache hits return without going through DRF rendering.
+
+    Args:
+        cache_key (str): The versioned cache key for the search.
+        data (dict): The serialized EarthquakeSearchResult data.
+    """
+    raw = ORJSONRenderer().render(data)
+    transaction.on_commit(lambda: cache.set(f"{cache_key}:raw", raw, timeout=SEARCH_CACHE_TIMEOUT))
 
 
 class CityView(APIView):
@@ -141,12 +160,15 @@ class EarthquakeSearchView(APIView):
         if order_param == "desc":
             order_by = "-created_at"
 
-        queryset = EarthquakeSearchResult.objects.order_by(order_by)
+        # Plain dicts with only the listed columns: no model instances, no raw_earthquake_data
+        queryset = EarthquakeSearchResult.objects.order_by(order_by).values(
+            *EarthquakeSearchHistorySerializer.VALUES_FIELDS
+        )
 
         paginator = EarthquakeSearchResultPagination()
         page = paginator.paginate_queryset(queryset, request)
 
-        serializer = EarthquakeSearchResultSerializer(page, many=True)
+        serializer = EarthquakeSearchHistorySerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
     @swagger_auto_schema(
@@ -165,7 +187,7 @@ class EarthquakeSearchView(APIView):
         Takes parameters {city_id, start, end} in request body.
             1) If EarthquakeSearchResult already exists for those parameters, return it.
             2) Otherwise, do the external search logic:
-               - fetch_earthquakes
+               - get_earthquake_catalog
                - find_nearest_earthquake
                - create EarthquakeSearchResult record
                - return new result
@@ -180,66 +202,80 @@ class EarthquakeSearchView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Validate & fetch city
-        try:
-            city = City.objects.get(id=city_id)
-        except City.DoesNotExist:
-            return Response({"error": "City not found"}, status=status.HTTP_404_NOT_FOUND)
-
         # Parse dates
-        start_date = parse_date(start_str)
-        end_date = parse_date(end_str)
-        if not start_date or not end_date or start_date > end_date:
+        try:
+            start_date = date.fromisoformat(start_str)
+            end_date = date.fromisoformat(end_str)
+        except (TypeError, ValueError):
+            return Response({"error": "Invalid start/end date"}, status=status.HTTP_400_BAD_REQUEST)
+        if start_date > end_date:
             return Response({"error": "Invalid start/end date"}, status=status.HTTP_400_BAD_REQUEST)
 
         # Check cache for quicker response
-        cache_key = f"earthquake:{city_id}:{start_str}:{end_str}"
-        cached_data = cache.get(cache_key)
-        if cached_data:
-            return Response(cached_data, status=status.HTTP_200_OK)
+        cache_key = get_search_cache_key(city_id, start_date, end_date)
+        cached_raw = cache.get(f"{cache_key}:raw")
+        if cached_raw:
+            return HttpResponse(cached_raw, content_type="application/json", status=status.HTTP_200_OK)
 
         # Check if there's an existing EarthquakeSearchResult for these params
-        existing_result = EarthquakeSearchResult.objects.filter(
-            city=city, start_date=start_date, end_date=end_date
-        ).first()
+        existing_result = (
+            EarthquakeSearchResult.objects.select_related("city")
+            .filter(city_id=city_id, start_date=start_date, end_date=end_date)
+            .first()
+        )
 
         if existing_result:
             # Return existing record
             serializer = EarthquakeSearchResultSerializer(existing_result)
-            cache.set(cache_key, serializer.data, 3600)
+            cache_search_result(cache_key, serializer.data)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
+        # Validate & fetch city, only needed when there's no stored result
+        try:
+            city = City.objects.get(id=city_id)
+        except City.DoesNotExist:
+            return Response({"error": "City not found"}, status=status.HTTP_404_NOT_FOUND)
+
         # 2) Not found -> proceed with external fetch logic
         try:
-            eq_data = fetch_earthquakes(start_date, end_date, min_magnitude=5.0)
+            catalog = get_earthquake_catalog(start_date, end_date, min_magnitude=5.0)
         except Exception as e:
             return Response(
                 {"error": f"Failed to fetch earthquakes: {str(e)}"},
                 status=status.HTTP_502_BAD_GATEWAY,
             )
 
-        nearest = find_nearest_earthquake(city.latitude, city.longitude, eq_data)
+        nearest, distance_km = find_nearest_earthquake(city.lat_rad, city.lon_rad, city.cos_lat, catalog)
 
         new_rec = EarthquakeSearchResult(
             city=city,
             start_date=start_date,
             end_date=end_date,
             raw_earthquake_data=nearest or {},
+            distance_km=distance_km,
         )
 
         if nearest:
             props = nearest["properties"]
             new_rec.nearest_earthquake_location = props["place"]
             new_rec.nearest_earthquake_magnitude = props["mag"]
-            dt_utc = datetime.utcfromtimestamp(props["time"] / 1000.0)
+            dt_utc = datetime.fromtimestamp(props["time"] / 1000.0, tz=timezone.utc)
             new_rec.nearest_earthquake_time = dt_utc
-            eq_lat = nearest["geometry"]["coordinates"][1]
-            eq_lon = nearest["geometry"]["coordinates"][0]
-            new_rec.distance_km = geodesic((city.latitude, city.longitude), (eq_lat, eq_lon)).km
 
-        new_rec.save()
+        try:
+            with transaction.atomic():
+                new_rec.save()
+        except IntegrityError:
+            # A concurrent request stored the same search first, return that one
+            existing_result = EarthquakeSearchResult.objects.select_related("city").get(
+                city_id=city_id, start_date=start_date, end_date=end_date
+            )
+            serializer = EarthquakeSearchResultSerializer(existing_result)
+            cache_search_result(cache_key, serializer.data)
+            return Response(serializer.data, status=status.HTTP_200_OK)
+
         serializer = EarthquakeSearchResultSerializer(instance=new_rec)
 
-        cache.set(cache_key, serializer.data, timeout=3600)
+        cache_search_result(cache_key, serializer.data)
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -1,13 +1,18 @@
-from datetime import date
-from decimal import Decimal
+from datetime import date, datetime, timezone
+from math import cos, radians
 from unittest.mock import patch
 
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from api.earthquake.models import City, EarthquakeSearchResult
+from api.earthquake.search_cache import bump_search_cache_version, get_search_cache_key
+from api.earthquake.serializers import EarthquakeSearchHistorySerializer, EarthquakeSearchResultSerializer
+from api.earthquake.services import build_earthquake_catalog
 
 dummy_cache_settings = {
     "default": {
@@ -15,6 +20,12 @@ dummy_cache_settings = {
     }
 }
 
+locmem_cache_settings = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 
 class CityViewTestCase(TestCase):
     """
@@ -32,8 +43,8 @@ class CityViewTestCase(TestCase):
         # Create a sample city to test with
         self.city = City.objects.create(
             name="Los Angeles",
-            latitude=Decimal("34.052235"),
-            longitude=Decimal("-118.243683"),
+            latitude=34.052235,
+            longitude=-118.243683,
         )
 
     def test_create_city(self) -> None:
@@ -46,6 +57,18 @@ class CityViewTestCase(TestCase):
         self.assertIn("id", response.data)
         self.assertEqual(response.data["name"], "Tokyo")
 
+    def test_create_city_derives_trig_columns(self) -> None:
+        """
+        Saving a city should store its coordinates in radians and its latitude cosine.
+        """
+        payload = {"name": "Tokyo", "latitude": "35.689487", "longitude": "139.691711"}
+        response = self.client.post(self.city_endpoint, payload, format="json")
+        city = City.objects.get(id=response.data["id"])
+        self.assertAlmostEqual(city.lat_rad, radians(35.689487))
+        self.assertAlmostEqual(city.lon_rad, radians(139.691711))
+        self.assertAlmostEqual(city.cos_lat, cos(radians(35.689487)))
+        self.assertNotIn("lat_rad", response.data)
+
     def test_create_city_duplicate(self) -> None:
         """
         Test creating a city that already exists returns a 400 error.
@@ -89,7 +112,7 @@ class EarthquakeSearchViewTestCase(TestCase):
     def setUp(self):
         self.client = APIClient()
         self.url = reverse("earthquakes")  # e.g. /api/earthquakes/
-        self.city = City.objects.create(name="Los Angeles", latitude=Decimal("34.05"), longitude=Decimal("-118.24"))
+        self.city = City.objects.create(name="Los Angeles", latitude=34.05, longitude=-118.24)
 
     def test_no_results_found(self):
         """
@@ -126,6 +149,12 @@ class EarthquakeSearchViewTestCase(TestCase):
         item = data["results"][0]
         self.assertEqual(item["nearest_earthquake_location"], "Near Ojai, CA")
         self.assertEqual(item["nearest_earthquake_magnitude"], 5.1)
+        # Without time and distance there's no nearest earthquake to describe
+        self.assertEqual(item["verbose_msg"], "No results found")
+        self.assertNotIn("raw_earthquake_data", item)
+        self.assertEqual(item["city"], self.city.id)
+        self.assertEqual(item["city_name"], "Los Angeles")
+        self.assertEqual(item["start_date"], "2021-06-01")
 
     def test_post_missing_fields(self):
         """
@@ -136,6 +165,16 @@ class EarthquakeSearchViewTestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("error", response.data)
 
+    def test_post_invalid_dates(self):
+        """
+        POST with a malformed date or a start after the end should return 400.
+        """
+        for start, end in (("2021-13-01", "2021-07-05"), ("June 1st", "2021-07-05"), ("2021-07-05", "2021-06-01")):
+            payload = {"city_id": self.city.id, "start": start, "end": end}
+            response = self.client.post(self.url, payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("error", response.data)
+
     def test_post_invalid_city(self):
         """
         POST with an invalid city_id should return 404.
@@ -170,17 +209,81 @@ class EarthquakeSearchViewTestCase(TestCase):
         self.assertEqual(response.data["nearest_earthquake_magnitude"], 5.0)
         self.assertEqual(response.data["id"], existing.id)
 
+    @override_settings(CACHES=locmem_cache_settings)
+    def test_post_cached_search(self):
+        """
+        A repeated POST for the same search should be served from the pre-rendered
+        JSON stored in the cache, without touching the database.
+        """
+        existing = EarthquakeSearchResult.objects.create(
+            city=self.city,
+            start_date=date(2021, 6, 1),
+            end_date=date(2021, 7, 5),
+            nearest_earthquake_location="Foo",
+            nearest_earthquake_magnitude=5.0,
+        )
+        payload = {"city_id": self.city.id, "start": "2021-06-01", "end": "2021-07-05"}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, payload, format="json")
+
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.json()["id"], existing.id)
+        self.assertEqual(response.json()["nearest_earthquake_location"], "Foo")
+
+    def test_duplicate_search_rejected(self):
+        """
+        The database should reject a second EarthquakeSearchResult for the same
+        (city, start_date, end_date), so concurrent searches can't store duplicates.
+        """
+        EarthquakeSearchResult.objects.create(city=self.city, start_date=date(2021, 6, 1), end_date=date(2021, 7, 5))
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            EarthquakeSearchResult.objects.create(
+                city=self.city, start_date=date(2021, 6, 1), end_date=date(2021, 7, 5)
+            )
+
+    @patch("api.earthquake.views.get_earthquake_catalog")
+    @override_settings(CACHES=dummy_cache_settings)
+    def test_post_concurrent_search(self, mock_fetch):
+        """
+        If another request stores the same search while this one is fetching from USGS,
+        POST should return that stored record with 200 instead of failing on the insert.
+        """
+        stored = {}
+
+        def store_concurrent_result(*args, **kwargs):
+            # Simulates a concurrent request winning the insert after our stored-result check
+            stored["result"] = EarthquakeSearchResult.objects.create(
+                city=self.city,
+                start_date=date(2021, 6, 1),
+                end_date=date(2021, 7, 5),
+                nearest_earthquake_location="Concurrent Quake",
+                nearest_earthquake_magnitude=6.1,
+            )
+            return build_earthquake_catalog([])
+
+        mock_fetch.side_effect = store_concurrent_result
+
+        payload = {"city_id": self.city.id, "start": "2021-06-01", "end": "2021-07-05"}
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["id"], stored["result"].id)
+        self.assertEqual(response.data["nearest_earthquake_location"], "Concurrent Quake")
+        self.assertEqual(EarthquakeSearchResult.objects.filter(city=self.city).count(), 1)
+
     @patch("api.earthquake.views.find_nearest_earthquake")
-    @patch("api.earthquake.views.fetch_earthquakes")
+    @patch("api.earthquake.views.get_earthquake_catalog")
     @override_settings(CACHES=dummy_cache_settings)
     def test_post_new_search(self, mock_fetch, mock_find_nearest):
         """
         If no existing record is found, POST should call external fetch,
         create a new EarthquakeSearchResult, and return 201.
         """
-        # Mock fetch_earthquakes to avoid real external calls
-        mock_fetch.return_value = {
-            "features": [
+        # Mock get_earthquake_catalog to avoid real external calls
+        mock_fetch.return_value = build_earthquake_catalog(
+            [
                 {
                     "geometry": {"coordinates": [-118.5, 34.2, 10.0]},
                     "properties": {
@@ -190,9 +293,9 @@ class EarthquakeSearchViewTestCase(TestCase):
                     },
                 }
             ]
-        }
+        )
         # Mock find_nearest_earthquake to pick the single feature
-        mock_find_nearest.return_value = mock_fetch.return_value["features"][0]
+        mock_find_nearest.return_value = (mock_fetch.return_value.features[0], 20.3)
 
         payload = {"city_id": self.city.id, "start": "2021-06-01", "end": "2021-07-05"}
         response = self.client.post(self.url, payload, format="json")
@@ -211,3 +314,133 @@ class EarthquakeSearchViewTestCase(TestCase):
         new_rec = qs.first()
         self.assertEqual(new_rec.nearest_earthquake_location, "Mock Quake")
         self.assertEqual(new_rec.nearest_earthquake_magnitude, 5.7)
+        self.assertEqual(new_rec.distance_km, 20.3)
+
+
+@override_settings(CACHES=locmem_cache_settings)
+class SearchCacheVersionTestCase(TestCase):
+    """
+    Test suite for the versioned earthquake search cache keys and when they are invalidated.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse("earthquakes")
+        self.city = City.objects.create(name="Los Angeles", latitude=34.05, longitude=-118.24)
+        self.key_args = (self.city.id, date(2021, 6, 1), date(2021, 7, 5))
+
+    def test_bump_changes_key(self) -> None:
+        """
+        Bumping the version should move every search to a new cache key.
+        """
+        before = get_search_cache_key(*self.key_args)
+        self.assertEqual(get_search_cache_key(*self.key_args), before)
+        bump_search_cache_version()
+        self.assertNotEqual(get_search_cache_key(*self.key_args), before)
+
+    def test_creating_city_keeps_version(self) -> None:
+        """
+        Adding a city can't affect other cities' searches, so their keys stay valid.
+        """
+        before = get_search_cache_key(*self.key_args)
+        with self.captureOnCommitCallbacks(execute=True):
+            City.objects.create(name="Tokyo", latitude=35.68, longitude=139.69)
+        self.assertEqual(get_search_cache_key(*self.key_args), before)
+
+    def test_updating_city_bumps_version(self) -> None:
+        """
+        Changing a city's coordinates should invalidate cached searches.
+        """
+        before = get_search_cache_key(*self.key_args)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.city.latitude = 34.1
+            self.city.save()
+        self.assertNotEqual(get_search_cache_key(*self.key_args), before)
+
+    def test_renaming_city_keeps_results(self) -> None:
+        """
+        A rename doesn't change where the city is, so its stored searches are kept.
+        """
+        EarthquakeSearchResult.objects.create(city=self.city, start_date=date(2021, 6, 1), end_date=date(2021, 7, 5))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.city.name = "LA"
+            self.city.save()
+        self.assertEqual(EarthquakeSearchResult.objects.filter(city=self.city).count(), 1)
+
+    @patch("api.earthquake.views.get_earthquake_catalog")
+    def test_moved_city_search_recomputed(self, mock_fetch) -> None:
+        """
+        After a city's coordinates change, searching again should recompute the nearest
+        earthquake instead of returning the result stored for the old location.
+        """
+        EarthquakeSearchResult.objects.create(
+            city=self.city,
+            start_date=date(2021, 6, 1),
+            end_date=date(2021, 7, 5),
+            nearest_earthquake_location="Old Quake",
+        )
+        payload = {"city_id": self.city.id, "start": "2021-06-01", "end": "2021-07-05"}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.data["nearest_earthquake_location"], "Old Quake")
+
+        mock_fetch.return_value = build_earthquake_catalog(
+            [
+                {
+                    "geometry": {"coordinates": [139.7, 35.7, 10.0]},
+                    "properties": {"time": 1625053800000, "place": "Tokyo Quake", "mag": 6.1},
+                }
+            ]
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.city.latitude = 35.68
+            self.city.longitude = 139.69
+            self.city.save()
+        self.assertFalse(EarthquakeSearchResult.objects.filter(nearest_earthquake_location="Old Quake").exists())
+
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["nearest_earthquake_location"], "Tokyo Quake")
+        mock_fetch.assert_called_once()
+
+    def test_deleted_city_search_not_served_from_cache(self) -> None:
+        """
+        Once a city is deleted, its cached search should no longer be returned.
+        """
+        EarthquakeSearchResult.objects.create(city=self.city, start_date=date(2021, 6, 1), end_date=date(2021, 7, 5))
+        payload = {"city_id": self.city.id, "start": "2021-06-01", "end": "2021-07-05"}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.city.delete()
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class EarthquakeSearchHistorySerializerTestCase(TestCase):
+    """
+    Test that the values()-based history serializer stays in step with the model serializer.
+    """
+
+    def test_matches_result_serializer(self) -> None:
+        """
+        A fully populated search should serialize identically through both serializers.
+        """
+        city = City.objects.create(name="Los Angeles", latitude=34.05, longitude=-118.24)
+        result = EarthquakeSearchResult.objects.create(
+            city=city,
+            start_date=date(2021, 6, 1),
+            end_date=date(2021, 7, 5),
+            raw_earthquake_data={"properties": {"place": "Mock Quake"}},
+            nearest_earthquake_location="Mock Quake",
+            nearest_earthquake_magnitude=5.7,
+            nearest_earthquake_time=datetime(2021, 6, 30, 10, 30, tzinfo=timezone.utc),
+            distance_km=20.3,
+        )
+        row = EarthquakeSearchResult.objects.values(*EarthquakeSearchHistorySerializer.VALUES_FIELDS).get(id=result.id)
+
+        expected = dict(EarthquakeSearchResultSerializer(EarthquakeSearchResult.objects.get(id=result.id)).data)
+        self.assertEqual(dict(EarthquakeSearchHistorySerializer(row).data), expected)
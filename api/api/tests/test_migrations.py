@@ -0,0 +1,47 @@
+from datetime import date
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class RemoveDuplicateSearchesMigrationTestCase(TransactionTestCase):
+    """
+    Test that migration 0002 removes duplicate searches left by concurrent inserts
+    before it adds the unique (city, start_date, end_date) constraint.
+    """
+
+    migrate_from = [("earthquake", "0001_initial")]
+    migrate_to = [("earthquake", "0002_earthquakesearchresult_uniq_search")]
+
+    def setUp(self) -> None:
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        apps = executor.loader.project_state(self.migrate_from).apps
+        City = apps.get_model("earthquake", "City")
+        EarthquakeSearchResult = apps.get_model("earthquake", "EarthquakeSearchResult")
+
+        city = City.objects.create(name="Los Angeles", latitude="34.05", longitude="-118.24")
+        self.kept_ids = []
+        for start, end, copies in ((date(2021, 6, 1), date(2021, 7, 5), 3), (date(2022, 1, 1), date(2022, 2, 1), 1)):
+            rows = [
+                EarthquakeSearchResult.objects.create(city=city, start_date=start, end_date=end)
+                for _ in range(copies)
+            ]
+            self.kept_ids.append(rows[0].id)
+
+    def tearDown(self) -> None:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_removed(self) -> None:
+        """
+        Only the lowest id of each duplicate group should survive the migration.
+        """
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+        apps = executor.loader.project_state(self.migrate_to).apps
+        EarthquakeSearchResult = apps.get_model("earthquake", "EarthquakeSearchResult")
+
+        remaining_ids = sorted(EarthquakeSearchResult.objects.values_list("id", flat=True))
+        self.assertEqual(remaining_ids, sorted(self.kept_ids))
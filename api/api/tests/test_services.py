@@ -0,0 +1,103 @@
+from datetime import date
+from math import cos, radians
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from api.earthquake.services import (
+    VECTORIZE_MIN_FEATURES,
+    build_earthquake_catalog,
+    find_nearest_earthquake,
+    get_earthquake_catalog,
+)
+
+locmem_cache_settings = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+
+def make_feature(lon: float, lat: float, place: str) -> dict:
+    """
+    Builds a minimal USGS GeoJSON feature for the given coordinates.
+    """
+    return {
+        "geometry": {"coordinates": [lon, lat, 10.0]},
+        "properties": {"time": 1625053800000, "place": place, "mag": 5.0},
+    }
+
+
+class FindNearestEarthquakeTestCase(SimpleTestCase):
+    """
+    Test suite for find_nearest_earthquake, covering both the plain loop
+    and the vectorized path.
+    """
+
+    def setUp(self) -> None:
+        # Los Angeles lat_rad, lon_rad and cos_lat, as City.save() stores them
+        self.city_args = (radians(34.05), radians(-118.24), cos(radians(34.05)))
+
+    def test_empty_input(self) -> None:
+        """
+        An empty catalog should return no feature and no distance.
+        """
+        catalog = build_earthquake_catalog([])
+        self.assertEqual(find_nearest_earthquake(*self.city_args, catalog), (None, None))
+
+    def test_small_feature_list(self) -> None:
+        """
+        With only a few features, the closest one should be returned.
+        """
+        features = [
+            make_feature(139.69, 35.68, "Tokyo"),
+            make_feature(-118.5, 34.2, "Near LA"),
+            make_feature(-70.66, -33.45, "Santiago"),
+        ]
+        nearest, distance_km = find_nearest_earthquake(*self.city_args, build_earthquake_catalog(features))
+        self.assertEqual(nearest["properties"]["place"], "Near LA")
+        # Haversine distance from (34.05, -118.24) to (34.2, -118.5)
+        self.assertAlmostEqual(distance_km, 29.2, delta=0.1)
+
+    def test_large_feature_list(self) -> None:
+        """
+        With enough features to take the vectorized path, the closest one should be returned.
+        """
+        features = [make_feature(100.0 + i * 0.1, -10.0, f"Far {i}") for i in range(VECTORIZE_MIN_FEATURES * 2)]
+        features.insert(17, make_feature(-118.5, 34.2, "Near LA"))
+        nearest, distance_km = find_nearest_earthquake(*self.city_args, build_earthquake_catalog(features))
+        self.assertEqual(nearest["properties"]["place"], "Near LA")
+        # Haversine distance from (34.05, -118.24) to (34.2, -118.5)
+        self.assertAlmostEqual(distance_km, 29.2, delta=0.1)
+
+
+@override_settings(CACHES=locmem_cache_settings)
+class GetEarthquakeCatalogTestCase(SimpleTestCase):
+    """
+    Test suite for get_earthquake_catalog and the catalog it restores from the cache.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.city_args = (radians(34.05), radians(-118.24), cos(radians(34.05)))
+
+    @patch("api.earthquake.services.fetch_earthquakes")
+    def test_cached_catalog(self, mock_fetch) -> None:
+        """
+        A second call for the same range should be served from the cache, and the restored
+        read-only arrays should still take the vectorized path to the closest feature.
+        """
+        features = [make_feature(100.0 + i * 0.1, -10.0, f"Far {i}") for i in range(VECTORIZE_MIN_FEATURES)]
+        features.insert(5, make_feature(-118.5, 34.2, "Near LA"))
+        mock_fetch.return_value = {"features": features}
+
+        get_earthquake_catalog(date(2021, 6, 1), date(2021, 7, 5))
+        catalog = get_earthquake_catalog(date(2021, 6, 1), date(2021, 7, 5))
+        mock_fetch.assert_called_once()
+        self.assertFalse(catalog.lons.flags.writeable)
+
+        nearest, distance_km = find_nearest_earthquake(*self.city_args, catalog)
+        self.assertEqual(nearest["properties"]["place"], "Near LA")
+        # Haversine distance from (34.05, -118.24) to (34.2, -118.5)
+        self.assertAlmostEqual(distance_km, 29.2, delta=0.1)
@@ -0,0 +1,29 @@
+from math import pi
+
+from django.test import SimpleTestCase
+
+from api.earthquake.utils import calculate_distance
+
+
+class CalculateDistanceTestCase(SimpleTestCase):
+    """
+    Test suite for the calculate_distance Haversine helper.
+    """
+
+    def test_same_point(self) -> None:
+        """
+        The distance from a point to itself should be zero.
+        """
+        self.assertEqual(calculate_distance(34.05, -118.24, 34.05, -118.24), 0.0)
+
+    def test_antipodal_points(self) -> None:
+        """
+        Opposite points on the equator should be half the Earth's circumference apart.
+        """
+        self.assertAlmostEqual(calculate_distance(0.0, 0.0, 0.0, 180.0), pi * 6371.0, places=6)
+
+    def test_known_distance(self) -> None:
+        """
+        Los Angeles to Tokyo should match the known great-circle distance.
+        """
+        self.assertAlmostEqual(calculate_distance(34.05, -118.24, 35.68, 139.69), 8816.6, delta=0.5)